@@ -24,33 +24,51 @@ Run this script with root privileges.
 # ----------------------------------------------------------------
 import asyncio
 import atexit
+import collections
+import contextlib
+import contextvars
 import datetime
 import filecmp
+import functools
 import gzip
+import hashlib
+import importlib.util
+import io
 import json
 import logging
 import os
 import platform
+import pwd
+import re
 import shutil
 import signal
+import stat
 import subprocess
+import ssl
 import sys
 import tarfile
 import tempfile
+import threading
 import time
+import urllib.request
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union, Callable, TypeVar
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Union, Callable, TypeVar
 
 try:
-    import pyfiglet
+    # pyfiglet is imported lazily by create_header; only check it is present.
+    if importlib.util.find_spec("pyfiglet") is None:
+        raise ImportError("pyfiglet")
     from rich.console import Console
     from rich.panel import Panel
     from rich.table import Table
     from rich.theme import Theme
     from rich.logging import RichHandler
     # Only import the spinner and text column to avoid flashing progress bars
-    from rich.progress import SpinnerColumn, TextColumn
+    from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn
+    from rich.markup import escape
     from rich.align import Align
     from rich.prompt import Prompt, Confirm
     from rich.text import Text
@@ -114,6 +132,17 @@ console = Console(theme=nord_theme)
 APP_NAME: str = "Fedora Setup & Hardening"
 VERSION: str = "1.0.0"
 OPERATION_TIMEOUT: int = 300  # default timeout for operations in seconds
+MAX_LOG_SIZE: int = 10 * 1024 * 1024  # rotate the setup log past this size
+LOG_BACKUP_COUNT: int = 5
+LOG_COPY_BUFSIZE: int = 1 << 20  # 1 MiB buffer for compressing rotated logs
+STREAM_CHUNK_SIZE: int = 64 * 1024  # read size for child output shown on progress rows
+STREAM_TAIL_LINES: int = 20  # streamed output lines kept for error reports
+CLEANUP_STAMP: Path = Path("/var/lib/fedora_setup/last_cleanup")
+CLEANUP_INTERVAL: int = 3600  # skip dnf cleanup if it ran within this many seconds
+CONFIG_SNAPSHOT_PATHS: List[str] = [
+    "/etc/yum.repos.d", "/etc/fstab", "/etc/default/grub",
+    "/etc/hosts", "/etc/ssh/sshd_config",
+]
 
 SETUP_STATUS: Dict[str, Dict[str, str]] = {
     "preflight": {"status": "pending", "message": ""},
@@ -131,8 +160,69 @@ SETUP_STATUS: Dict[str, Dict[str, str]] = {
     "final": {"status": "pending", "message": ""},
 }
 
+# Rich style for each SETUP_STATUS status in the report table.
+STATUS_STYLES: Dict[str, str] = {
+    "pending": "debug",
+    "in_progress": "warning",
+    "success": "success",
+    "failed": "error",
+}
+
+FAIL2BAN_JAIL_LOCAL: bytes = (
+    b"[DEFAULT]\n"
+    b"bantime  = 600\n"
+    b"findtime = 600\n"
+    b"maxretry = 3\n"
+    b"backend  = systemd\n"
+    b"usedns   = warn\n\n"
+    b"[sshd]\n"
+    b"enabled  = true\n"
+    b"port     = ssh\n"
+    b"logpath  = /var/log/secure\n"
+    b"maxretry = 3\n"
+)
+
+# Written to /etc/environment and the user's environment.d file.
+WAYLAND_ENV_VARS: Dict[bytes, bytes] = {
+    b"GDK_BACKEND": b"wayland",
+    b"QT_QPA_PLATFORM": b"wayland",
+    b"SDL_VIDEODRIVER": b"wayland",
+    b"MOZ_ENABLE_WAYLAND": b"1",
+    b"MOZ_DBUS_REMOTE": b"1",
+}
+
+# (schema, key, value) triples applied with `gsettings set` as the user.
+GSETTINGS_APPEARANCE: Tuple[Tuple[str, str, str], ...] = (
+    ("org.gnome.desktop.interface", "gtk-theme", "Fedora-dark"),
+    ("org.gnome.desktop.interface", "color-scheme", "prefer-dark"),
+    ("org.gnome.desktop.interface", "icon-theme", "Fedora"),
+    ("org.gnome.desktop.background", "show-desktop-icons", "true"),
+    ("org.gnome.Terminal.Legacy.Settings", "theme-variant", "dark"),
+    ("org.gnome.shell.extensions.dash-to-dock", "dock-position", "BOTTOM"),
+    ("org.gnome.shell.extensions.dash-to-dock", "extend-height", "false"),
+    ("org.gnome.shell.extensions.dash-to-dock", "transparency-mode", "FIXED"),
+)
+
+# Applies "schema key value" triples from its arguments, one gsettings call each.
+GSETTINGS_BATCH_SCRIPT: str = (
+    'while [ "$#" -ge 3 ]; do '
+    'gsettings set "$1" "$2" "$3" || echo "failed to set $1 $2" >&2; '
+    'shift 3; '
+    'done'
+)
+
+# os-release values may be double-quoted, single-quoted or bare.
+OS_RELEASE_RE = re.compile(r"""^([A-Z0-9_]+)=(?:"([^"]*)"|'([^']*)'|(.*))$""")
+# First keyword of an active (non-comment) sshd_config line.
+SSHD_KEY_RE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9]*)\b")
+
 T = TypeVar("T")
 
+# Shared worker pool for blocking helpers; installed as the event loop's
+# default executor so every run_in_executor/to_thread call reuses it.
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fedora_setup")
+atexit.register(EXECUTOR.shutdown)
+
 # ----------------------------------------------------------------
 # Dataclasses
 # ----------------------------------------------------------------
@@ -158,7 +248,7 @@ class Config:
         "git", "openssh-server", "firewalld", "curl", "wget", "rsync", "sudo",
         "bash-completion", "net-tools", "nmap", "tcpdump", "fail2ban", "wireshark", "masscan", "netcat", "arp-scan", "hydra", "clamav", "lynis",
         # Core utilities
-        "python3", "python3-pip", "ca-certificates", "dnf-plugins-core", "gnupg2", "gnupg", "pinentry", "seahorse", "keepassxc",
+        "python3", "python3-pip", "ca-certificates", "dnf-plugins-core", "flatpak", "gnupg2", "gnupg", "pinentry", "seahorse", "keepassxc",
         # Development tools
         "gcc", "gcc-c++", "make", "cmake", "ninja-build", "meson", "gettext", "pkgconf",
         "python3-devel", "openssl-devel", "libffi-devel", "zlib-devel", "readline-devel",
@@ -245,15 +335,33 @@ class Config:
 
     FIREWALL_PORTS: List[str] = field(default_factory=lambda: ["22", "80", "443"])
 
+    # Services whose state is reported in the final checks.
+    SERVICES: List[str] = field(default_factory=lambda: ["sshd", "firewalld", "fail2ban", "tailscaled"])
+
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
+@dataclass(frozen=True)
+class PreflightFacts:
+    """Host facts established once by the pre-flight phase and reused afterwards."""
+    os_release: Dict[str, str] = field(default_factory=dict)
+
 # ----------------------------------------------------------------
 # UI Helper Functions
 # ----------------------------------------------------------------
 def clear_screen() -> None:
     console.clear()
 
+_pyfiglet = None
+
+@functools.lru_cache(maxsize=64)
+def _render_figlet(text: str, font: str, width: int) -> str:
+    global _pyfiglet
+    if _pyfiglet is None:
+        import pyfiglet as _pyfiglet_mod
+        _pyfiglet = _pyfiglet_mod
+    return _pyfiglet.Figlet(font=font, width=width).renderText(text)
+
 def create_header(title: str = APP_NAME) -> Panel:
     term_width, _ = shutil.get_terminal_size((80, 24))
     fonts: List[str] = ["slant", "small", "digital", "mini", "smslant"]
@@ -265,8 +373,7 @@ def create_header(title: str = APP_NAME) -> Panel:
     ascii_art = ""
     for font in fonts:
         try:
-            fig = pyfiglet.Figlet(font=font, width=min(term_width - 10, 120))
-            ascii_art = fig.renderText(title)
+            ascii_art = _render_figlet(title, font, min(term_width - 10, 120))
             if ascii_art.strip():
                 break
         except Exception:
@@ -318,18 +425,22 @@ def display_panel(message: str, style: str = NordColors.FROST_2, title: Optional
     )
     console.print(panel)
 
+def set_status(task_name: str, status: str, message: str) -> None:
+    """Update a SETUP_STATUS entry in place instead of allocating a new dict."""
+    entry = SETUP_STATUS.get(task_name)
+    if entry is None:
+        SETUP_STATUS[task_name] = {"status": status, "message": message}
+    else:
+        entry["status"] = status
+        entry["message"] = message
+
 def print_status_report() -> None:
     table = Table(title="Setup Status Report", style="banner")
     table.add_column("Task", style="header")
     table.add_column("Status", style="info")
     table.add_column("Message", style="info")
     for key, data in SETUP_STATUS.items():
-        status_color = {
-            "pending": "debug",
-            "in_progress": "warning",
-            "success": "success",
-            "failed": "error",
-        }.get(data["status"].lower(), "info")
+        status_color = STATUS_STYLES.get(data["status"].lower(), "info")
         table.add_row(
             key.replace("_", " ").title(),
             f"[{status_color}]{data['status'].upper()}[/{status_color}]",
@@ -346,6 +457,44 @@ def print_status_report() -> None:
 # ----------------------------------------------------------------
 # Logger Setup
 # ----------------------------------------------------------------
+def _create_private_file(path: Union[str, Path]) -> None:
+    """Create path with mode 0600 in one open(2), fixing the mode only if it differs."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    try:
+        if stat.S_IMODE(os.fstat(fd).st_mode) != 0o600:
+            os.fchmod(fd, 0o600)
+    finally:
+        os.close(fd)
+
+def _gzip_log_namer(name: str) -> str:
+    return f"{name}.gz"
+
+def _gzip_log_rotator(source: str, dest: str) -> None:
+    # Level 1 with a 1 MiB buffer: logs still compress well and the rollover
+    # costs a fraction of the CPU of the default level 9.
+    with open(source, "rb", buffering=LOG_COPY_BUFSIZE) as f_in, \
+            gzip.open(dest, "wb", compresslevel=1) as raw, \
+            io.BufferedWriter(raw, buffer_size=LOG_COPY_BUFSIZE) as f_out:
+        shutil.copyfileobj(f_in, f_out, LOG_COPY_BUFSIZE)
+    os.chmod(dest, 0o600)
+    os.remove(source)
+    # Recreate the live log before the handler reopens it so it stays 0600.
+    _create_private_file(source)
+
+def _zstd_log_namer(name: str) -> str:
+    return f"{name}.zst"
+
+def _zstd_log_rotator(source: str, dest: str) -> None:
+    # zstd -T0 compresses on every core and beats gzip on speed at a similar
+    # ratio; -f because the handler has already moved any older dest away.
+    subprocess.run(
+        ["zstd", "-q", "-f", "-T0", "-o", dest, source],
+        check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+    )
+    os.chmod(dest, 0o600)
+    os.remove(source)
+    _create_private_file(source)
+
 def setup_logger(log_file: Union[str, Path]) -> logging.Logger:
     log_file = Path(log_file)
     log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -353,18 +502,30 @@ def setup_logger(log_file: Union[str, Path]) -> logging.Logger:
     logger.setLevel(logging.DEBUG)
     for h in logger.handlers[:]:
         logger.removeHandler(h)
+    chmod_error = None
+    try:
+        _create_private_file(log_file)
+    except OSError as e:
+        chmod_error = e
     console_handler = RichHandler(console=console, rich_tracebacks=True)
     console_handler.setLevel(logging.INFO)
     logger.addHandler(console_handler)
-    file_handler = logging.FileHandler(log_file)
+    # Rotation happens inside the handler when the log outgrows MAX_LOG_SIZE,
+    # instead of compressing the whole file up front.
+    file_handler = RotatingFileHandler(log_file, maxBytes=MAX_LOG_SIZE, backupCount=LOG_BACKUP_COUNT)
+    # Prefer zstd when installed; the in-process gzip path needs nothing extra.
+    if shutil.which("zstd"):
+        file_handler.namer = _zstd_log_namer
+        file_handler.rotator = _zstd_log_rotator
+    else:
+        file_handler.namer = _gzip_log_namer
+        file_handler.rotator = _gzip_log_rotator
     file_handler.setLevel(logging.DEBUG)
     formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S")
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
-    try:
-        os.chmod(str(log_file), 0o600)
-    except Exception as e:
-        logger.warning(f"Could not set permissions on log file {log_file}: {e}")
+    if chmod_error is not None:
+        logger.warning(f"Could not set permissions on log file {log_file}: {chmod_error}")
     return logger
 
 # ----------------------------------------------------------------
@@ -395,9 +556,113 @@ def setup_signal_handlers(loop: asyncio.AbstractEventLoop) -> None:
     for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
         loop.add_signal_handler(sig, lambda sig=sig: asyncio.create_task(signal_handler_async(sig, None)))
 
+# ----------------------------------------------------------------
+# OS Release Helper
+# ----------------------------------------------------------------
+def read_os_release() -> Dict[str, str]:
+    """Return os-release fields, preferring the cached stdlib parser (Python 3.10+)."""
+    try:
+        return platform.freedesktop_os_release()
+    except (OSError, AttributeError):
+        pass
+    os_info: Dict[str, str] = {}
+    for path in ("/etc/os-release", "/usr/lib/os-release"):
+        try:
+            with open(path) as f:
+                for line in f:
+                    m = OS_RELEASE_RE.match(line.strip())
+                    if m:
+                        os_info[m.group(1)] = next(g for g in m.groups()[1:] if g is not None)
+            break
+        except OSError:
+            continue
+    return os_info
+
+def read_meminfo() -> Dict[str, int]:
+    """Parse /proc/meminfo in one pass into {field: value in KiB}."""
+    meminfo: Dict[str, int] = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            fields = value.split()
+            if fields:
+                meminfo[key] = int(fields[0])
+    return meminfo
+
+def read_loadavg() -> Tuple[float, float, float]:
+    """Return the 1/5/15-minute load averages from /proc/loadavg."""
+    with open("/proc/loadavg") as f:
+        one, five, fifteen = (float(x) for x in f.read().split()[:3])
+    return one, five, fifteen
+
+# ----------------------------------------------------------------
+# File Copy Helper
+# ----------------------------------------------------------------
+def copy_file_sendfile(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Copy src to dst in kernel space via sendfile(2), then copy metadata like shutil.copy2."""
+    with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+        remaining = os.fstat(f_in.fileno()).st_size
+        offset = 0
+        while remaining > 0:
+            sent = os.sendfile(f_out.fileno(), f_in.fileno(), offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+    shutil.copystat(src, dst)
+
+def write_config_file(path: Union[str, Path], lines: List[str]) -> None:
+    """Write config lines with one open and one write, always with LF line endings."""
+    with open(path, "w", buffering=1 << 16, encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lines) + "\n")
+
+def files_match(src: Path, src_st: os.stat_result, dest: Path, dest_st: os.stat_result) -> bool:
+    """filecmp.cmp(shallow=True) semantics using stat results the caller already has."""
+    if src_st.st_size != dest_st.st_size:
+        return False
+    if src_st.st_mtime == dest_st.st_mtime:
+        return True
+    return filecmp.cmp(src, dest, shallow=False)
+
+def dirs_differ(dcmp: filecmp.dircmp) -> bool:
+    """True if the left tree of dcmp has files missing or different on the right.
+
+    Uses dircmp's shallow (stat signature) comparison and stops at the first
+    difference; files that only exist on the right are ignored.
+    """
+    if dcmp.left_only or dcmp.diff_files or dcmp.funny_files:
+        return True
+    return any(dirs_differ(sub) for sub in dcmp.subdirs.values())
+
 # ----------------------------------------------------------------
 # Download Helper
 # ----------------------------------------------------------------
+DOWNLOAD_BUFSIZE: int = 1 << 20
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    # Loading the CA bundle is the expensive part; build the context once.
+    return ssl.create_default_context()
+
+def _fetch_url(url: str, dest: Path, timeout: int, abandoned: threading.Event) -> None:
+    # Write to a side file and rename on success: if the caller gives up on
+    # a timeout this thread keeps running, and it must not leave a partial
+    # dest behind or publish one after the caller has moved on.
+    part = dest.with_name(dest.name + ".part")
+    try:
+        with urllib.request.urlopen(url, timeout=timeout, context=_ssl_context()) as resp, \
+                open(part, "wb", buffering=DOWNLOAD_BUFSIZE) as f_out:
+            while chunk := resp.read(DOWNLOAD_BUFSIZE):
+                if abandoned.is_set():
+                    raise TimeoutError(f"Download of {url} abandoned")
+                f_out.write(chunk)
+        if abandoned.is_set():
+            raise TimeoutError(f"Download of {url} abandoned")
+        os.replace(part, dest)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+
 async def download_file_async(url: str, dest: Union[str, Path], timeout: int = 300) -> None:
     dest = Path(dest)
     logger = logging.getLogger("fedora_setup")
@@ -406,7 +671,24 @@ async def download_file_async(url: str, dest: Union[str, Path], timeout: int = 3
         return
     logger.info(f"Downloading {url} to {dest}...")
     loop = asyncio.get_running_loop()
+    abandoned = threading.Event()
     try:
+        # Download in-process first; wget/curl are only a fallback, which
+        # saves a fork/exec and a separate TLS setup per file.
+        try:
+            await asyncio.wait_for(
+                loop.run_in_executor(None, _fetch_url, url, dest, timeout, abandoned), timeout=timeout
+            )
+            logger.info(f"Download complete: {dest}")
+            return
+        except asyncio.TimeoutError:
+            # A subclass of OSError on 3.11+; the time budget is spent, so
+            # do not start the whole wait again with wget/curl. The worker
+            # thread cannot be cancelled, only told to stop.
+            abandoned.set()
+            raise
+        except (OSError, ssl.SSLError) as e:
+            logger.warning(f"urllib download failed ({e}); falling back to external tools.")
         if shutil.which("wget"):
             proc = await asyncio.create_subprocess_exec(
                 "wget", "-q", "--show-progress", url, "-O", str(dest),
@@ -424,8 +706,7 @@ async def download_file_async(url: str, dest: Union[str, Path], timeout: int = 3
             if proc.returncode != 0:
                 raise Exception(f"curl failed with return code {proc.returncode}")
         else:
-            import urllib.request
-            await loop.run_in_executor(None, urllib.request.urlretrieve, url, dest)
+            raise Exception("Neither wget nor curl is available")
         logger.info(f"Download complete: {dest}")
     except asyncio.TimeoutError:
         logger.error(f"Download timed out after {timeout} seconds")
@@ -441,6 +722,40 @@ async def download_file_async(url: str, dest: Union[str, Path], timeout: int = 3
 # ----------------------------------------------------------------
 # Progress Utility: Run Function with Spinner Indicator
 # ----------------------------------------------------------------
+_progress: Optional[Progress] = None
+_progress_users: int = 0
+# (progress, row, description) of the step running in the current task, so
+# run_command_async can show a child's output on that step's own row.
+_progress_row: contextvars.ContextVar[Optional[Tuple[Progress, TaskID, str]]] = contextvars.ContextVar(
+    "progress_row", default=None
+)
+
+@contextlib.contextmanager
+def _shared_progress():
+    """Yield the one live spinner display, starting it for the first user.
+
+    Rich allows only one live display at a time, so concurrent steps add
+    their own task rows to a shared Progress instead of opening another.
+    """
+    global _progress, _progress_users
+    if _progress is None:
+        # Use only a spinner and text for progress (no progress bar)
+        _progress = Progress(
+            SpinnerColumn(style=f"bold {NordColors.FROST_1}"),
+            TextColumn("{task.description}"),
+            console=console,
+            transient=True,
+        )
+        _progress.start()
+    _progress_users += 1
+    try:
+        yield _progress
+    finally:
+        _progress_users -= 1
+        if _progress_users == 0:
+            _progress.stop()
+            _progress = None
+
 async def run_with_progress_async(
     description: str,
     func: Callable[..., Any],
@@ -449,86 +764,193 @@ async def run_with_progress_async(
     **kwargs: Any,
 ) -> Any:
     if task_name:
-        SETUP_STATUS[task_name] = {
-            "status": "in_progress",
-            "message": f"{description} in progress...",
-        }
-    # Use only a spinner and text for progress (no progress bar)
-    from rich.progress import Progress
-    with Progress(
-        SpinnerColumn(style=f"bold {NordColors.FROST_1}"),
-        TextColumn("{task.description}"),
-        console=console,
-        transient=True,
-    ) as progress:
+        set_status(task_name, "in_progress", f"{description} in progress...")
+    with _shared_progress() as progress:
         task_id = progress.add_task(description, total=None)
-        start = time.time()
+        row_token = _progress_row.set((progress, task_id, description))
+        start = time.monotonic()
         try:
             if asyncio.iscoroutinefunction(func):
                 result = await func(*args, **kwargs)
             else:
                 loop = asyncio.get_running_loop()
                 result = await loop.run_in_executor(None, lambda: func(*args, **kwargs))
-            elapsed = time.time() - start
-            progress.update(task_id, completed=100)
+            elapsed = time.monotonic() - start
+            progress.remove_task(task_id)
             console.print(f"[success]✓ {description} completed in {elapsed:.2f}s[/success]")
             if task_name:
-                SETUP_STATUS[task_name] = {
-                    "status": "success",
-                    "message": f"Completed in {elapsed:.2f}s",
-                }
+                set_status(task_name, "success", f"Completed in {elapsed:.2f}s")
             return result
         except Exception as e:
-            elapsed = time.time() - start
-            progress.update(task_id, completed=100)
+            elapsed = time.monotonic() - start
+            progress.remove_task(task_id)
             console.print(f"[error]✗ {description} failed in {elapsed:.2f}s: {e}[/error]")
             if task_name:
-                SETUP_STATUS[task_name] = {
-                    "status": "failed",
-                    "message": f"Failed after {elapsed:.2f}s: {str(e)}",
-                }
+                set_status(task_name, "failed", f"Failed after {elapsed:.2f}s: {str(e)}")
             raise
+        finally:
+            _progress_row.reset(row_token)
 
 # ----------------------------------------------------------------
 # Command Execution Utilities
 # ----------------------------------------------------------------
+async def _stream_to_progress(
+    proc: asyncio.subprocess.Process, progress: Progress, task_id: TaskID, description: str
+) -> bytes:
+    """Mirror a child's latest output line onto its progress row and into the debug log.
+
+    Returns the last STREAM_TAIL_LINES lines, so a failure can still be reported.
+    """
+    logger = logging.getLogger("fedora_setup")
+    pending = b""
+    tail: Deque[str] = collections.deque(maxlen=STREAM_TAIL_LINES)
+    try:
+        while True:
+            # Read whatever is buffered (up to 64 KiB) rather than a line at a
+            # time: chatty dnf/flatpak output then costs one wakeup per chunk,
+            # and an overlong line cannot trip the StreamReader line limit.
+            chunk = await proc.stdout.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                lines = [pending] if pending else []
+            else:
+                *lines, pending = (pending + chunk).split(b"\n")
+            latest = ""
+            for line in lines:
+                # Progress meters redraw with \r; only the last redraw matters.
+                text = line.decode("utf-8", "replace").rstrip().rpartition("\r")[2].strip()
+                if text:
+                    logger.debug(text)
+                    tail.append(text)
+                    latest = text
+            if latest:
+                progress.update(task_id, description=f"{description} [dim]{escape(latest[:60])}[/dim]")
+            if not chunk:
+                break
+        await proc.wait()
+        return "\n".join(tail).encode("utf-8")
+    finally:
+        progress.update(task_id, description=description)
+
+# dnf5 fails on a held rpm lock instead of waiting for it, and steps that
+# run concurrently may each fall back to a dnf install; take turns.
+_dnf_lock = asyncio.Lock()
+
 async def run_command_async(
     cmd: List[str],
     capture_output: bool = False,
     text: bool = False,
     check: bool = True,
     timeout: Optional[int] = OPERATION_TIMEOUT,
+    close_fds: bool = False,
 ) -> subprocess.CompletedProcess:
     logger = logging.getLogger("fedora_setup")
-    logger.debug(f"Running command: {' '.join(cmd)}")
+    if __debug__:
+        # Stripped under `python -O`, along with the join and f-string that
+        # would otherwise run for every command.
+        logger.debug(f"Running command: {' '.join(cmd)}")
     stdout = asyncio.subprocess.PIPE if capture_output else None
     stderr = asyncio.subprocess.PIPE if capture_output else None
-    try:
-        proc = await asyncio.create_subprocess_exec(*cmd, stdout=stdout, stderr=stderr)
-        stdout_data, stderr_data = await asyncio.wait_for(proc.communicate(), timeout=timeout)
-        if text and stdout_data is not None:
-            stdout_data = stdout_data.decode("utf-8")
-        if text and stderr_data is not None:
-            stderr_data = stderr_data.decode("utf-8")
-        result = subprocess.CompletedProcess(
-            args=cmd,
-            returncode=proc.returncode,
-            stdout=stdout_data if capture_output else None,
-            stderr=stderr_data if capture_output else None,
-        )
-        if check and proc.returncode != 0:
-            raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout_data, stderr=stderr_data)
-        return result
-    except asyncio.TimeoutError:
-        logger.error(f"Command timed out after {timeout} seconds: {' '.join(cmd)}")
-        raise Exception(f"Command timed out: {' '.join(cmd)}")
+    # Uncaptured output inside a progress step would tear the live display;
+    # stream it onto the step's row instead.
+    row = None if capture_output else _progress_row.get()
+    if row is not None:
+        stdout, stderr = asyncio.subprocess.PIPE, asyncio.subprocess.STDOUT
+    async with _dnf_lock if cmd[0] == "dnf" else contextlib.nullcontext():
+        try:
+            # The setup runs unattended, so children never get a terminal to read
+            # from. Descriptors Python opens are non-inheritable (PEP 446), so
+            # close_fds defaults to False; together with an absolute executable
+            # (argv[0] is left untouched) that lets Popen use posix_spawn instead
+            # of fork+exec.
+            executable = cmd[0] if os.path.dirname(cmd[0]) else _which(cmd[0])
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, executable=executable, stdin=asyncio.subprocess.DEVNULL,
+                stdout=stdout, stderr=stderr, close_fds=close_fds
+            )
+            if row is not None:
+                stderr_data = None
+                stdout_data = await asyncio.wait_for(_stream_to_progress(proc, *row), timeout=timeout)
+                if proc.returncode != 0 and stdout_data:
+                    # The row is transient and the lines went to the debug
+                    # log only; surface the tail so the failure is readable.
+                    logger.error(
+                        f"{' '.join(cmd)} exited with status {proc.returncode}; last output:\n"
+                        + stdout_data.decode("utf-8", "replace")
+                    )
+            else:
+                stdout_data, stderr_data = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            if text and stdout_data is not None:
+                stdout_data = stdout_data.decode("utf-8")
+            if text and stderr_data is not None:
+                stderr_data = stderr_data.decode("utf-8")
+            result = subprocess.CompletedProcess(
+                args=cmd,
+                returncode=proc.returncode,
+                stdout=stdout_data if capture_output else None,
+                stderr=stderr_data if capture_output else None,
+            )
+            if check and proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout_data, stderr=stderr_data)
+            return result
+        except asyncio.TimeoutError:
+            logger.error(f"Command timed out after {timeout} seconds: {' '.join(cmd)}")
+            raise Exception(f"Command timed out: {' '.join(cmd)}")
+
+@functools.lru_cache(maxsize=128)
+def _which(cmd: str) -> Optional[str]:
+    return shutil.which(cmd)
 
 async def command_exists_async(cmd: str) -> bool:
+    # Cached: call _which.cache_clear() after installing something new.
+    return _which(cmd) is not None
+
+def _import_optional(module: str) -> None:
     try:
-        await run_command_async(["which", cmd], check=True, capture_output=True)
-        return True
-    except Exception:
-        return False
+        importlib.import_module(module)
+    except ImportError:
+        pass
+
+def _prewarm() -> None:
+    """Import pystemd and load the TLS trust store in parallel before the run.
+
+    Both are first needed deep inside phases (the final unit checks and the
+    first download); doing them up front keeps that latency out of the
+    timed phases.
+    """
+    futures = [EXECUTOR.submit(_import_optional, "pystemd.systemd1"), EXECUTOR.submit(_ssl_context)]
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            print_warning(f"Pre-warm step failed: {e}")
+
+def _query_unit_dbus(unit: str) -> Optional[Tuple[str, str]]:
+    try:
+        from pystemd.systemd1 import Unit
+    except ImportError:
+        return None
+    u = Unit(unit.encode())
+    u.load()
+    return u.Unit.ActiveState.decode(), u.Unit.UnitFileState.decode()
+
+async def service_state_async(unit: str) -> Tuple[str, str]:
+    """Return (ActiveState, UnitFileState) for a systemd unit.
+
+    Queries systemd over D-Bus when pystemd is available and falls back to a
+    single `systemctl show` otherwise.
+    """
+    try:
+        state = await asyncio.to_thread(_query_unit_dbus, unit)
+        if state is not None:
+            return state
+    except Exception as e:
+        logging.getLogger("fedora_setup").debug(f"D-Bus query for {unit} failed: {e}")
+    result = await run_command_async(
+        ["systemctl", "show", "-p", "ActiveState", "-p", "UnitFileState", unit],
+        capture_output=True, text=True, check=False,
+    )
+    props = dict(line.split("=", 1) for line in (result.stdout or "").splitlines() if "=" in line)
+    return props.get("ActiveState", "unknown"), props.get("UnitFileState", "unknown")
 
 # ----------------------------------------------------------------
 # Main Setup Class for Fedora
@@ -537,8 +959,54 @@ class FedoraDesktopSetup:
     def __init__(self, config: Config = Config()):
         self.config = config
         self.logger = setup_logger(self.config.LOG_FILE)
-        self.start_time = time.time()
+        # Monotonic, so an NTP step mid-run cannot skew the reported runtime.
+        self.start_ns = time.monotonic_ns()
         self._current_task = None
+        fedora_dir = self.config.USER_HOME / "github/bash/linux/fedora"
+        self._dotfiles_src = fedora_dir / "dotfiles"
+        self._scripts_src = fedora_dir / "_scripts"
+        self._user_env_file = self.config.USER_HOME / ".config/environment.d/wayland.conf"
+        # "user:user" owner spec passed to every chown -R.
+        self._owner = f"{self.config.USERNAME}:{self.config.USERNAME}"
+        # Filled in by phase_preflight; later phases read it instead of re-probing.
+        self.preflight: Optional[PreflightFacts] = None
+        # Set once firewalld has been reloaded, which drops Fail2ban's bans.
+        self._firewall_reloaded = False
+
+    async def run_steps_async(
+        self, steps: List[Tuple[str, Callable[..., Any]]], task_name: Optional[str] = None
+    ) -> bool:
+        """Run dependent (description, func) steps in order; True if all succeed.
+
+        A failing step is logged and the remaining steps still run, matching
+        run_concurrently_async.
+        """
+        status = True
+        for description, func in steps:
+            try:
+                if not await run_with_progress_async(description, func, task_name=task_name):
+                    status = False
+            except Exception as e:
+                self.logger.error(f"{description} failed: {e}")
+                status = False
+        return status
+
+    async def run_concurrently_async(
+        self, steps: List[Tuple[str, Callable[..., Any]]], task_name: Optional[str] = None
+    ) -> bool:
+        """Run independent (description, func) steps concurrently; True if all succeed."""
+        results = await asyncio.gather(
+            *(run_with_progress_async(description, func, task_name=task_name) for description, func in steps),
+            return_exceptions=True,
+        )
+        status = True
+        for (description, _), result in zip(steps, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"{description} failed: {result}")
+                status = False
+            elif not result:
+                status = False
+        return status
 
     async def print_section_async(self, title: str) -> None:
         console.print(create_header(title))
@@ -551,8 +1019,12 @@ class FedoraDesktopSetup:
             return None
         timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
         backup_path = file_path.with_suffix(file_path.suffix + f".bak.{timestamp}")
+        loop = asyncio.get_running_loop()
         try:
-            shutil.copy2(file_path, backup_path)
+            # Copy on the shared executor so backups taken by concurrently
+            # running steps overlap instead of blocking the event loop; the
+            # data itself moves in-kernel via sendfile.
+            await loop.run_in_executor(None, copy_file_sendfile, file_path, backup_path)
             self.logger.debug(f"Backed up {file_path} to {backup_path}")
             return str(backup_path)
         except Exception as e:
@@ -562,53 +1034,86 @@ class FedoraDesktopSetup:
     async def cleanup_async(self) -> None:
         self.logger.info("Performing cleanup before exit...")
         try:
-            tmp = Path(tempfile.gettempdir())
-            for item in tmp.glob("fedora_setup_*"):
-                try:
-                    if item.is_file():
-                        item.unlink()
-                    else:
-                        shutil.rmtree(item)
-                except Exception as e:
-                    self.logger.warning(f"Failed to clean up {item}: {e}")
-            try:
-                await self.rotate_logs_async()
-            except Exception as e:
-                self.logger.warning(f"Failed to rotate logs: {e}")
+            # Temp file removal, log rotation and flushing dirty pages are
+            # independent, so overlap them instead of running them back to back.
+            temp_result, rotate_result, sync_result = await asyncio.gather(
+                asyncio.to_thread(self._remove_temp_files),
+                self.rotate_logs_async(),
+                asyncio.to_thread(os.sync),
+                return_exceptions=True,
+            )
+            if isinstance(temp_result, Exception):
+                self.logger.warning(f"Failed to clean up temporary files: {temp_result}")
+            if isinstance(rotate_result, Exception):
+                self.logger.warning(f"Failed to rotate logs: {rotate_result}")
+            if isinstance(sync_result, Exception):
+                self.logger.warning(f"Failed to sync filesystems: {sync_result}")
             self.logger.info("Cleanup completed.")
         except Exception as e:
             self.logger.error(f"Cleanup failed: {e}")
 
-    async def rotate_logs_async(self, log_file: Optional[str] = None) -> bool:
-        if log_file is None:
-            log_file = self.config.LOG_FILE
-        log_path = Path(log_file)
-        if not log_path.is_file():
-            self.logger.warning(f"Log file {log_path} does not exist.")
+    def _remove_temp_files(self) -> None:
+        with os.scandir(tempfile.gettempdir()) as entries:
+            for entry in entries:
+                if not entry.name.startswith("fedora_setup_"):
+                    continue
+                try:
+                    # Never follow links: a planted symlink to a directory is
+                    # removed itself rather than rmtree'd through.
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                except Exception as e:
+                    self.logger.warning(f"Failed to clean up {entry.path}: {e}")
+
+    async def rotate_logs_async(self) -> bool:
+        handler = next((h for h in self.logger.handlers if isinstance(h, RotatingFileHandler)), None)
+        if handler is None:
+            self.logger.warning("No rotating log handler is configured.")
             return False
         try:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            rotated = f"{log_path}.{timestamp}.gz"
             loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, lambda: self._compress_log(log_path, rotated))
-            self.logger.info(f"Log rotated to {rotated}")
+            await loop.run_in_executor(None, lambda: self._force_rollover(handler))
+            self.logger.info(f"Log rotated to {handler.rotation_filename(handler.baseFilename + '.1')}")
             return True
         except Exception as e:
             self.logger.warning(f"Log rotation failed: {e}")
             return False
 
-    def _compress_log(self, log_path: Path, rotated_path: str) -> None:
-        with open(log_path, "rb") as f_in, gzip.open(rotated_path, "wb") as f_out:
-            shutil.copyfileobj(f_in, f_out)
-        open(log_path, "w").close()
+    @staticmethod
+    def _force_rollover(handler: RotatingFileHandler) -> None:
+        handler.acquire()
+        try:
+            handler.doRollover()
+        finally:
+            handler.release()
 
     async def has_internet_connection_async(self) -> bool:
-        try:
-            await run_command_async(["ping", "-c", "1", "-W", "5", "8.8.8.8"],
-                                    capture_output=True, check=False)
+        async def probe(host: str, port: int) -> bool:
+            try:
+                _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=5)
+            except (OSError, asyncio.TimeoutError):
+                return False
+            writer.close()
             return True
-        except Exception:
+
+        # Open a TCP connection to each host at once and succeed on the first
+        # handshake: no ping process, no CAP_NET_RAW, and a dead host costs
+        # at most one timeout instead of stacking them.
+        targets = [("1.1.1.1", 53), ("8.8.8.8", 53), ("fedoraproject.org", 443)]
+        tasks = [asyncio.create_task(probe(host, port)) for host, port in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    if await next_done:
+                        return True
+                except Exception:
+                    continue
             return False
+        finally:
+            for task in tasks:
+                task.cancel()
 
     # ----------------------------------------------------------------
     # Phase 0: Pre-Flight Checks
@@ -617,9 +1122,20 @@ class FedoraDesktopSetup:
         await self.print_section_async("Pre-flight Checks & Backups")
         try:
             await run_with_progress_async("Checking for root privileges", self.check_root_async, task_name="preflight")
-            await run_with_progress_async("Checking network connectivity", self.check_network_async, task_name="preflight")
-            await run_with_progress_async("Verifying Fedora distribution", self.check_fedora_async, task_name="preflight")
-            await run_with_progress_async("Saving configuration snapshot", self.save_config_snapshot_async, task_name="preflight")
+            # The snapshot only reads local files, so start it now and let it
+            # run while the network probe waits on the wire; join it before
+            # the phase ends so later phases still see a finished backup.
+            snapshot = asyncio.create_task(run_with_progress_async(
+                "Saving configuration snapshot", self.save_config_snapshot_async, task_name="preflight"
+            ))
+            try:
+                await run_with_progress_async("Checking network connectivity", self.check_network_async, task_name="preflight")
+                os_info = await run_with_progress_async("Verifying Fedora distribution", self.check_fedora_async, task_name="preflight")
+            except BaseException:
+                snapshot.cancel()
+                raise
+            await snapshot
+            self.preflight = PreflightFacts(os_release=os_info)
             return True
         except Exception as e:
             self.logger.error(f"Pre-flight phase failed: {e}")
@@ -639,32 +1155,42 @@ class FedoraDesktopSetup:
             self.logger.error("No network connectivity. Please check your settings.")
             sys.exit(1)
 
-    async def check_fedora_async(self) -> None:
+    async def check_fedora_async(self) -> Dict[str, str]:
         try:
-            result = await run_command_async(["lsb_release", "-a"], capture_output=True, text=True)
-            if "Fedora" not in result.stdout:
+            os_info = read_os_release()
+            if os_info.get("ID") != "fedora":
                 self.logger.warning("This may not be a Fedora system. Some features may not work.")
             else:
-                version = next((line.split(":")[1].strip() for line in result.stdout.splitlines() if line.startswith("Release:")), "Unknown")
+                version = os_info.get("VERSION_ID", "Unknown")
                 self.logger.info(f"Fedora version {version} detected.")
+            return os_info
         except Exception as e:
             self.logger.warning(f"Could not verify Fedora: {e}")
+            return {}
 
     async def save_config_snapshot_async(self) -> Optional[str]:
         timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
         backup_dir = Path("/var/backups")
         backup_dir.mkdir(exist_ok=True)
         snapshot_file = backup_dir / f"fedora_config_snapshot_{timestamp}.tar.gz"
+        marker = backup_dir / "fedora_config_snapshot.sha1"
         try:
             loop = asyncio.get_running_loop()
+            digest = await loop.run_in_executor(None, self._config_snapshot_digest)
+            try:
+                last_digest, _, last_snapshot = marker.read_text().strip().partition(" ")
+            except OSError:
+                last_digest, last_snapshot = "", ""
+            if digest == last_digest and last_snapshot and Path(last_snapshot).is_file():
+                self.logger.info(f"Configuration unchanged since {last_snapshot}; skipping snapshot.")
+                return last_snapshot
             files_added = []
             def create_archive():
                 nonlocal files_added
-                with tarfile.open(snapshot_file, "w:gz") as tar:
-                    for config_path in [
-                        "/etc/yum.repos.d", "/etc/fstab", "/etc/default/grub",
-                        "/etc/hosts", "/etc/ssh/sshd_config"
-                    ]:
+                # Small text configs: gzip level 1 is nearly as compact as the
+                # default level 9 and several times faster.
+                with tarfile.open(snapshot_file, "w:gz", compresslevel=1) as tar:
+                    for config_path in CONFIG_SNAPSHOT_PATHS:
                         path = Path(config_path)
                         if path.exists():
                             tar.add(str(path), arcname=path.name)
@@ -674,6 +1200,7 @@ class FedoraDesktopSetup:
                 for path in files_added:
                     self.logger.info(f"Included {path} in snapshot.")
                 self.logger.info(f"Configuration snapshot saved: {snapshot_file}")
+                marker.write_text(f"{digest} {snapshot_file}\n")
                 return str(snapshot_file)
             else:
                 self.logger.warning("No configuration files found for snapshot.")
@@ -682,16 +1209,30 @@ class FedoraDesktopSetup:
             self.logger.warning(f"Failed to create config snapshot: {e}")
             return None
 
+    def _config_snapshot_digest(self) -> str:
+        """SHA1 over the names and contents of every file in CONFIG_SNAPSHOT_PATHS."""
+        sha = hashlib.sha1()
+        for config_path in CONFIG_SNAPSHOT_PATHS:
+            path = Path(config_path)
+            files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+            for file in files:
+                try:
+                    data = file.read_bytes()
+                except OSError:
+                    continue
+                sha.update(str(file).encode() + b"\0")
+                sha.update(hashlib.sha1(data).digest())
+        return sha.hexdigest()
+
     # ----------------------------------------------------------------
     # Phase 1: System Update & Basic Configuration
     # ----------------------------------------------------------------
     async def phase_system_update(self) -> bool:
         await self.print_section_async("System Update & Basic Configuration")
-        status = True
-        if not await run_with_progress_async("Updating package repositories", self.update_repos_async, task_name="system_update"):
-            status = False
-        if not await run_with_progress_async("Upgrading system packages", self.upgrade_system_async, task_name="system_update"):
-            status = False
+        status = await self.run_steps_async([
+            ("Updating package repositories", self.update_repos_async),
+            ("Upgrading system packages", self.upgrade_system_async),
+        ], task_name="system_update")
         success, failed = await run_with_progress_async("Installing required packages", self.install_packages_async, task_name="system_update")
         if failed and len(failed) > len(self.config.PACKAGES) * 0.1:
             self.logger.error(f"Failed to install too many packages: {', '.join(failed)}")
@@ -710,6 +1251,12 @@ class FedoraDesktopSetup:
 
     async def upgrade_system_async(self) -> bool:
         try:
+            # `dnf check-update` exits 0 when nothing is pending and 100 when
+            # updates exist; skip the full upgrade transaction in the first case.
+            pending = await run_command_async(["dnf", "check-update", "-q"], capture_output=True, check=False)
+            if pending.returncode == 0:
+                self.logger.info("No package updates available; skipping upgrade.")
+                return True
             self.logger.info("Upgrading system packages using dnf...")
             await run_command_async(["dnf", "upgrade", "-y"])
             self.logger.info("System upgrade complete.")
@@ -718,44 +1265,42 @@ class FedoraDesktopSetup:
             self.logger.error(f"System upgrade failed: {e}")
             return False
 
+    async def installed_packages_async(self) -> Set[str]:
+        """Return the names of all installed RPMs from a single rpm query."""
+        try:
+            result = await run_command_async(
+                ["rpm", "-qa", "--qf", "%{NAME}\n"], check=False, capture_output=True, text=True
+            )
+            return set(result.stdout.split())
+        except Exception as e:
+            self.logger.warning(f"Failed to query installed packages: {e}")
+            return set()
+
     async def install_packages_async(self) -> Tuple[List[str], List[str]]:
         self.logger.info("Checking for required packages...")
-        missing, success, failed = [], [], []
-        for pkg in self.config.PACKAGES:
-            try:
-                result = await run_command_async(["rpm", "-q", pkg], check=False, capture_output=True)
-                if result.returncode == 0:
-                    self.logger.debug(f"Package already installed: {pkg}")
-                    success.append(pkg)
-                else:
-                    missing.append(pkg)
-            except Exception:
-                missing.append(pkg)
+        success, failed = [], []
+        installed = await self.installed_packages_async()
+        missing = [pkg for pkg in self.config.PACKAGES if pkg not in installed]
+        success.extend(pkg for pkg in self.config.PACKAGES if pkg in installed)
         if missing:
             self.logger.info(f"Installing missing packages: {' '.join(missing)}")
             try:
+                # One transaction keeps the resolver's problem (and the
+                # dnf/rpm trigger work) to a single pass. Weak dependencies
+                # stay on: desktop packages rely on them for codecs, fonts
+                # and plugins.
                 await run_command_async(["dnf", "install", "-y"] + missing)
                 self.logger.info("Missing packages installed successfully.")
-                for pkg in missing:
-                    try:
-                        result = await run_command_async(["rpm", "-q", pkg], check=False, capture_output=True)
-                        if result.returncode == 0:
-                            success.append(pkg)
-                        else:
-                            failed.append(pkg)
-                    except Exception:
-                        failed.append(pkg)
             except subprocess.CalledProcessError as e:
                 self.logger.error(f"Failed to install packages: {e}")
-                for pkg in missing:
-                    try:
-                        result = await run_command_async(["rpm", "-q", pkg], check=False, capture_output=True)
-                        if result.returncode == 0:
-                            success.append(pkg)
-                        else:
-                            failed.append(pkg)
-                    except Exception:
-                        failed.append(pkg)
+            # Even a partly failed transaction can add binaries to PATH.
+            _which.cache_clear()
+            installed = await self.installed_packages_async()
+            for pkg in missing:
+                if pkg in installed:
+                    success.append(pkg)
+                else:
+                    failed.append(pkg)
         else:
             self.logger.info("All required packages are installed.")
         return success, failed
@@ -765,78 +1310,100 @@ class FedoraDesktopSetup:
     # ----------------------------------------------------------------
     async def phase_repo_shell_setup(self) -> bool:
         await self.print_section_async("Repository & Shell Setup")
-        status = True
-        if not await run_with_progress_async("Setting up GitHub repositories", self.setup_repos_async, task_name="repo_shell"):
-            status = False
-        if not await run_with_progress_async("Copying shell configurations", self.copy_shell_configs_async, task_name="repo_shell"):
-            status = False
-        if not await run_with_progress_async("Copying configuration folders", self.copy_config_folders_async, task_name="repo_shell"):
-            status = False
-        if not await run_with_progress_async("Setting default shell to bash", self.set_bash_shell_async, task_name="repo_shell"):
+        status = await self.run_steps_async([
+            ("Setting up GitHub repositories", self.setup_repos_async),
+        ], task_name="repo_shell")
+        # Everything below reads the freshly synced repos but is otherwise
+        # independent, so it runs concurrently once the repos are in place.
+        if not await self.run_concurrently_async([
+            ("Copying shell configurations", self.copy_shell_configs_async),
+            ("Copying configuration folders", self.copy_config_folders_async),
+            ("Setting default shell to bash", self.set_bash_shell_async),
+        ], task_name="repo_shell"):
             status = False
         return status
 
     async def setup_repos_async(self) -> bool:
         gh_dir = self.config.USER_HOME / "github"
         gh_dir.mkdir(exist_ok=True)
-        all_success = True
         repos = ["bash", "python"]
-        for repo in repos:
-            repo_dir = gh_dir / repo
-            if (repo_dir / ".git").is_dir():
-                self.logger.info(f"Repository '{repo}' exists; pulling updates...")
-                try:
-                    await run_command_async(["git", "-C", str(repo_dir), "pull"])
-                except subprocess.CalledProcessError:
-                    self.logger.warning(f"Failed to update repository '{repo}'.")
-                    all_success = False
-            else:
-                self.logger.info(f"Cloning repository '{repo}'...")
-                try:
-                    await run_command_async(["git", "clone", f"https://github.com/dunamismax/{repo}.git", str(repo_dir)])
-                except subprocess.CalledProcessError:
-                    self.logger.warning(f"Failed to clone repository '{repo}'.")
-                    all_success = False
+        # Clones/pulls are independent network waits; overlap them.
+        results = await asyncio.gather(*(self._sync_one_repo_async(gh_dir, repo) for repo in repos))
+        all_success = all(results)
         try:
-            await run_command_async(["chown", "-R", f"{self.config.USERNAME}:{self.config.USERNAME}", str(gh_dir)])
+            await run_command_async(["chown", "-R", self._owner, str(gh_dir)])
         except subprocess.CalledProcessError:
             self.logger.warning(f"Failed to set ownership of {gh_dir}.")
             all_success = False
         return all_success
 
+    async def _sync_one_repo_async(self, gh_dir: Path, repo: str) -> bool:
+        repo_dir = gh_dir / repo
+        if (repo_dir / ".git").is_dir():
+            self.logger.info(f"Repository '{repo}' exists; pulling updates...")
+            try:
+                await run_command_async(["git", "-C", str(repo_dir), "pull"])
+            except subprocess.CalledProcessError:
+                self.logger.warning(f"Failed to update repository '{repo}'.")
+                return False
+        else:
+            self.logger.info(f"Cloning repository '{repo}'...")
+            try:
+                await run_command_async(["git", "clone", f"https://github.com/dunamismax/{repo}.git", str(repo_dir)])
+            except subprocess.CalledProcessError:
+                self.logger.warning(f"Failed to clone repository '{repo}'.")
+                return False
+        return True
+
     async def copy_shell_configs_async(self) -> bool:
-        source_dir = self.config.USER_HOME / "github" / "bash" / "linux" / "fedora" / "dotfiles"
+        source_dir = self._dotfiles_src
         if not source_dir.is_dir():
             self.logger.error(f"Fedora-specific dotfiles not found in {source_dir}.")
             return False
         destination_dirs = [self.config.USER_HOME, Path("/root")]
+        try:
+            user_pw = pwd.getpwnam(self.config.USERNAME)
+        except KeyError:
+            self.logger.error(f"User {self.config.USERNAME} does not exist.")
+            return False
         overall = True
-        for file_name in [".bashrc", ".profile"]:
-            src = source_dir / file_name
-            if not src.is_file():
-                self.logger.warning(f"Source file {src} not found; skipping.")
-                continue
-            for dest_dir in destination_dirs:
+        wanted = (".bashrc", ".profile")
+        # Stat each source once via scandir and each destination once via
+        # os.stat, and reuse those results for the compare and the backup.
+        with os.scandir(source_dir) as entries:
+            src_stats = {e.name: e.stat() for e in entries if e.name in wanted and e.is_file()}
+        for file_name in wanted:
+            if file_name not in src_stats:
+                self.logger.warning(f"Source file {source_dir / file_name} not found; skipping.")
+        loop = asyncio.get_running_loop()
+        for dest_dir in destination_dirs:
+            owner = (user_pw.pw_uid, user_pw.pw_gid) if dest_dir == self.config.USER_HOME else (0, 0)
+            for file_name, src_st in src_stats.items():
+                src = source_dir / file_name
                 dest = dest_dir / file_name
-                loop = asyncio.get_running_loop()
-                files_identical = dest.is_file() and await loop.run_in_executor(None, lambda: filecmp.cmp(src, dest))
-                if dest.is_file() and files_identical:
+                try:
+                    dest_st = os.stat(dest)
+                except OSError:
+                    dest_st = None
+                dest_is_file = dest_st is not None and stat.S_ISREG(dest_st.st_mode)
+                if dest_is_file and await loop.run_in_executor(
+                    None, lambda: files_match(src, src_st, dest, dest_st)
+                ):
                     self.logger.info(f"File {dest} is already up-to-date.")
-                else:
-                    try:
-                        if dest.is_file():
-                            await self.backup_file_async(dest)
-                        await loop.run_in_executor(None, lambda: shutil.copy2(src, dest))
-                        owner = f"{self.config.USERNAME}:{self.config.USERNAME}" if dest_dir == self.config.USER_HOME else "root:root"
-                        await run_command_async(["chown", owner, str(dest)])
-                        self.logger.info(f"Copied {src} to {dest}.")
-                    except Exception as e:
-                        self.logger.warning(f"Failed to copy {src} to {dest}: {e}")
-                        overall = False
+                    continue
+                try:
+                    if dest_is_file:
+                        await self.backup_file_async(dest)
+                    await loop.run_in_executor(None, lambda: copy_file_sendfile(src, dest))
+                    os.chown(dest, *owner)
+                    self.logger.info(f"Copied {src} to {dest}.")
+                except Exception as e:
+                    self.logger.warning(f"Failed to copy {src} to {dest}: {e}")
+                    overall = False
         return overall
 
     async def copy_config_folders_async(self) -> bool:
-        src = self.config.USER_HOME / "github" / "bash" / "linux" / "fedora" / "dotfiles"
+        src = self._dotfiles_src
         if not src.is_dir():
             self.logger.error(f"Fedora-specific dotfiles directory not found in {src}.")
             return False
@@ -845,11 +1412,21 @@ class FedoraDesktopSetup:
         overall = True
         try:
             loop = asyncio.get_running_loop()
-            src_dirs = [item for item in src.iterdir() if item.is_dir()]
+            # scandir yields the entry type with the name, so picking out the
+            # subdirectories needs no extra stat per entry.
+            with os.scandir(src) as entries:
+                src_dirs = [Path(e.path) for e in entries if e.is_dir()]
             for item in src_dirs:
                 dest_path = dest / item.name
+                if dest_path.is_dir():
+                    changed = await loop.run_in_executor(
+                        None, lambda: dirs_differ(filecmp.dircmp(item, dest_path))
+                    )
+                    if not changed:
+                        self.logger.info(f"{dest_path} is already up-to-date.")
+                        continue
                 await loop.run_in_executor(None, lambda: shutil.copytree(item, dest_path, dirs_exist_ok=True))
-                await run_command_async(["chown", "-R", f"{self.config.USERNAME}:{self.config.USERNAME}", str(dest_path)])
+                await run_command_async(["chown", "-R", self._owner, str(dest_path)])
                 self.logger.info(f"Copied {item} to {dest_path}.")
             return overall
         except Exception as e:
@@ -861,23 +1438,38 @@ class FedoraDesktopSetup:
             self.logger.info("Bash not found; installing...")
             try:
                 await run_command_async(["dnf", "install", "-y", "bash"])
+                _which.cache_clear()
             except subprocess.CalledProcessError:
                 self.logger.warning("Bash installation failed.")
                 return False
         shells_file = Path("/etc/shells")
         loop = asyncio.get_running_loop()
+
+        def ensure_bash_listed() -> bool:
+            # One open for read + append; "a+" also creates a missing file.
+            with shells_file.open("a+") as f:
+                f.seek(0)
+                content = f.read()
+                if "/bin/bash" in content:
+                    return False
+                if content and not content.endswith("\n"):
+                    f.write("\n")
+                f.write("/bin/bash\n")
+                return True
+
         try:
-            if shells_file.exists():
-                content = await loop.run_in_executor(None, shells_file.read_text)
-                if "/bin/bash" not in content:
-                    await loop.run_in_executor(None, lambda: shells_file.open("a").write("/bin/bash\n"))
-                    self.logger.info("Added /bin/bash to /etc/shells.")
-            else:
-                await loop.run_in_executor(None, lambda: shells_file.write_text("/bin/bash\n"))
-                self.logger.info("Created /etc/shells with /bin/bash.")
+            if await loop.run_in_executor(None, ensure_bash_listed):
+                self.logger.info("Added /bin/bash to /etc/shells.")
         except Exception as e:
             self.logger.warning(f"Failed to update /etc/shells: {e}")
             return False
+        try:
+            if pwd.getpwnam(self.config.USERNAME).pw_shell == "/bin/bash":
+                self.logger.info(f"Default shell for {self.config.USERNAME} is already /bin/bash.")
+                return True
+        except KeyError:
+            self.logger.warning(f"User {self.config.USERNAME} does not exist.")
+            return False
         try:
             await run_command_async(["chsh", "-s", "/bin/bash", self.config.USERNAME])
             self.logger.info(f"Default shell for {self.config.USERNAME} set to /bin/bash.")
@@ -891,13 +1483,24 @@ class FedoraDesktopSetup:
     # ----------------------------------------------------------------
     async def phase_security_hardening(self) -> bool:
         await self.print_section_async("Security Hardening")
+        # SSH is independent of the other two, so it runs alongside them.
+        # Fail2ban bans through firewalld and a firewall reload drops those
+        # runtime rules, so Fail2ban must come after the firewall step.
+        results = await asyncio.gather(
+            run_with_progress_async("Configuring SSH", self.configure_ssh_async, task_name="security"),
+            self.run_steps_async([
+                ("Configuring firewall", self.configure_firewall_async),
+                ("Configuring Fail2ban", self.configure_fail2ban_async),
+            ], task_name="security"),
+            return_exceptions=True,
+        )
         status = True
-        if not await run_with_progress_async("Configuring SSH", self.configure_ssh_async, task_name="security"):
-            status = False
-        if not await run_with_progress_async("Configuring firewall", self.configure_firewall_async, task_name="security"):
-            status = False
-        if not await run_with_progress_async("Configuring Fail2ban", self.configure_fail2ban_async, task_name="security"):
-            status = False
+        for result in results:
+            if isinstance(result, BaseException):
+                self.logger.error(f"Security hardening step failed: {result}")
+                status = False
+            elif not result:
+                status = False
         return status
 
     async def configure_ssh_async(self) -> bool:
@@ -922,20 +1525,27 @@ class FedoraDesktopSetup:
         if not sshd_config.is_file():
             self.logger.error(f"SSHD configuration file not found: {sshd_config}")
             return False
-        await self.backup_file_async(sshd_config)
         try:
             loop = asyncio.get_running_loop()
-            lines = await loop.run_in_executor(None, lambda: sshd_config.read_text().splitlines())
-            for key, val in self.config.SSH_CONFIG.items():
-                found = False
-                for i, line in enumerate(lines):
-                    if line.strip().startswith(key):
-                        lines[i] = f"{key} {val}"
-                        found = True
-                        break
-                if not found:
-                    lines.append(f"{key} {val}")
-            await loop.run_in_executor(None, lambda: sshd_config.write_text("\n".join(lines) + "\n"))
+            original = await loop.run_in_executor(None, lambda: sshd_config.read_text().splitlines())
+            lines = list(original)
+            # Single pass: replace the first occurrence of each managed key,
+            # then append whatever keys the file did not mention.
+            remaining = dict(self.config.SSH_CONFIG)
+            for i, line in enumerate(lines):
+                m = SSHD_KEY_RE.match(line)
+                if m is None:
+                    continue
+                key = m.group(1)
+                if key in remaining:
+                    lines[i] = f"{key} {remaining.pop(key)}"
+            lines.extend(f"{key} {val}" for key, val in remaining.items())
+            if lines == original:
+                # Nothing to change: skip the backup, the write and the restart.
+                self.logger.info("SSH configuration already up to date.")
+                return True
+            await self.backup_file_async(sshd_config)
+            await loop.run_in_executor(None, write_config_file, sshd_config, lines)
             await run_command_async(["systemctl", "restart", "sshd"])
             self.logger.info("SSH configuration updated and service restarted.")
             return True
@@ -948,6 +1558,7 @@ class FedoraDesktopSetup:
             self.logger.error("firewall-cmd not found. Installing firewalld...")
             try:
                 await run_command_async(["dnf", "install", "-y", "firewalld"])
+                _which.cache_clear()
                 if not await command_exists_async("firewall-cmd"):
                     self.logger.error("firewalld installation failed.")
                     return False
@@ -955,14 +1566,17 @@ class FedoraDesktopSetup:
                 self.logger.error(f"Failed to install firewalld: {e}")
                 return False
         try:
+            # firewall-cmd talks to the running daemon over D-Bus, so bring it
+            # up first; `enable --now` does the enable and start in one call.
+            await run_command_async(["systemctl", "enable", "--now", "firewalld"])
+            self.logger.info("firewalld enabled and started.")
             await run_command_async(["firewall-cmd", "--set-default-zone=public"])
-            for port in self.config.FIREWALL_PORTS:
-                await run_command_async(["firewall-cmd", "--permanent", "--zone=public", "--add-port", f"{port}/tcp"])
-                self.logger.info(f"Allowed TCP port {port}.")
+            add_ports = [f"--add-port={port}/tcp" for port in self.config.FIREWALL_PORTS]
+            if add_ports:
+                await run_command_async(["firewall-cmd", "--permanent", "--zone=public", *add_ports])
+                self.logger.info(f"Allowed TCP ports {', '.join(self.config.FIREWALL_PORTS)}.")
             await run_command_async(["firewall-cmd", "--reload"])
-            await run_command_async(["systemctl", "enable", "firewalld"])
-            await run_command_async(["systemctl", "start", "firewalld"])
-            self.logger.info("firewalld enabled and started.")
+            self._firewall_reloaded = True
             return True
         except subprocess.CalledProcessError as e:
             self.logger.warning(f"Failed to configure firewall: {e}")
@@ -971,24 +1585,25 @@ class FedoraDesktopSetup:
     async def configure_fail2ban_async(self) -> bool:
         jail_local = Path("/etc/fail2ban/jail.local")
         jail_local.parent.mkdir(parents=True, exist_ok=True)
-        config_content = (
-            "[DEFAULT]\n"
-            "bantime  = 600\n"
-            "findtime = 600\n"
-            "maxretry = 3\n"
-            "backend  = systemd\n"
-            "usedns   = warn\n\n"
-            "[sshd]\n"
-            "enabled  = true\n"
-            "port     = ssh\n"
-            "logpath  = /var/log/secure\n"
-            "maxretry = 3\n"
-        )
         try:
-            if jail_local.is_file():
-                await self.backup_file_async(jail_local)
             loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, lambda: jail_local.write_text(config_content))
+            current = await loop.run_in_executor(None, jail_local.read_bytes) if jail_local.is_file() else None
+            if current == FAIL2BAN_JAIL_LOCAL and not self._firewall_reloaded:
+                # Unchanged config: just make sure the service is up rather
+                # than restarting it and resetting its ban state.
+                self.logger.info("Fail2ban configuration already up to date.")
+                await run_command_async(["systemctl", "enable", "--now", "fail2ban"])
+                return True
+            if current == FAIL2BAN_JAIL_LOCAL:
+                # The firewall reload wiped the bans from firewalld; a restart
+                # restores them from Fail2ban's database.
+                self.logger.info("Fail2ban configuration already up to date; restarting to restore bans.")
+                await run_command_async(["systemctl", "enable", "fail2ban"])
+                await run_command_async(["systemctl", "restart", "fail2ban"])
+                return True
+            if current is not None:
+                await self.backup_file_async(jail_local)
+            await loop.run_in_executor(None, lambda: jail_local.write_bytes(FAIL2BAN_JAIL_LOCAL))
             self.logger.info("Fail2ban configuration written.")
             await run_command_async(["systemctl", "enable", "fail2ban"])
             await run_command_async(["systemctl", "restart", "fail2ban"])
@@ -1003,24 +1618,25 @@ class FedoraDesktopSetup:
     # ----------------------------------------------------------------
     async def phase_user_customization(self) -> bool:
         await self.print_section_async("User Customization & Script Deployment")
-        status = True
-        if not await run_with_progress_async("Deploying user scripts", self.deploy_user_scripts_async, task_name="user_custom"):
-            status = False
-        if not await run_with_progress_async("Configuring system appearance", self.configure_appearance_async, task_name="user_custom"):
-            status = False
-        return status
+        return await self.run_concurrently_async([
+            ("Deploying user scripts", self.deploy_user_scripts_async),
+            ("Configuring system appearance", self.configure_appearance_async),
+        ], task_name="user_custom")
 
     async def deploy_user_scripts_async(self) -> bool:
-        src = self.config.USER_HOME / "github" / "bash" / "linux" / "fedora" / "_scripts"
+        src = self._scripts_src
         if not src.is_dir():
             self.logger.error(f"Script source directory {src} does not exist.")
             return False
         target = self.config.USER_HOME / "bin"
         target.mkdir(exist_ok=True)
         try:
-            await run_command_async(["rsync", "-ah", "--delete", f"{src}/", f"{target}/"])
-            await run_command_async(["find", str(target), "-type", "f", "-exec", "chmod", "755", "{}", ";"])
-            await run_command_async(["chown", "-R", f"{self.config.USERNAME}:{self.config.USERNAME}", str(target)])
+            # rsync sets file modes and ownership as it copies, so no separate
+            # find/chmod and chown -R walks over the target are needed.
+            await run_command_async([
+                "rsync", "-ah", "--delete", "--chmod=F755", f"--chown={self._owner}",
+                f"{src}/", f"{target}/"
+            ])
             self.logger.info("User scripts deployed successfully.")
             return True
         except subprocess.CalledProcessError as e:
@@ -1031,27 +1647,20 @@ class FedoraDesktopSetup:
         user_dconf_dir = self.config.USER_HOME / ".config" / "dconf"
         user_dconf_dir.mkdir(parents=True, exist_ok=True)
         try:
-            passwd_info = await run_command_async(["getent", "passwd", self.config.USERNAME], capture_output=True, text=True)
-            uid = passwd_info.stdout.split(":")[2]
-            gsettings_commands = [
-                ["gsettings", "set", "org.gnome.desktop.interface", "gtk-theme", "Fedora-dark"],
-                ["gsettings", "set", "org.gnome.desktop.interface", "color-scheme", "prefer-dark"],
-                ["gsettings", "set", "org.gnome.desktop.interface", "icon-theme", "Fedora"],
-                ["gsettings", "set", "org.gnome.desktop.background", "show-desktop-icons", "true"],
-                ["gsettings", "set", "org.gnome.Terminal.Legacy.Settings", "theme-variant", "dark"],
-                ["gsettings", "set", "org.gnome.shell.extensions.dash-to-dock", "dock-position", "BOTTOM"],
-                ["gsettings", "set", "org.gnome.shell.extensions.dash-to-dock", "extend-height", "false"],
-                ["gsettings", "set", "org.gnome.shell.extensions.dash-to-dock", "transparency-mode", "FIXED"],
-            ]
-            for cmd in gsettings_commands:
-                try:
-                    await run_command_async(
-                        ["sudo", "-u", self.config.USERNAME, "env", f"DBUS_SESSION_BUS_ADDRESS=unix:path=/run/user/{uid}/bus"] + cmd,
-                        check=False
-                    )
-                except Exception as e:
-                    self.logger.debug(f"Non-critical error while setting {cmd}: {e}")
-            await run_command_async(["chown", "-R", f"{self.config.USERNAME}:{self.config.USERNAME}", str(user_dconf_dir)])
+            uid = pwd.getpwnam(self.config.USERNAME).pw_uid
+            # One sudo (and one PAM session) for every setting: the triples go
+            # in as positional arguments, so nothing is interpolated into the
+            # script, and each failure is reported without stopping the rest.
+            args = [item for triple in GSETTINGS_APPEARANCE for item in triple]
+            result = await run_command_async(
+                ["sudo", "-u", self.config.USERNAME, "env",
+                 f"DBUS_SESSION_BUS_ADDRESS=unix:path=/run/user/{uid}/bus",
+                 "sh", "-c", GSETTINGS_BATCH_SCRIPT, "sh"] + args,
+                check=False, capture_output=True, text=True
+            )
+            for line in result.stderr.splitlines():
+                self.logger.debug(f"Non-critical error while applying gsettings: {line}")
+            await run_command_async(["chown", "-R", self._owner, str(user_dconf_dir)])
             self.logger.info("System appearance settings applied.")
             return True
         except Exception as e:
@@ -1063,25 +1672,70 @@ class FedoraDesktopSetup:
     # ----------------------------------------------------------------
     async def phase_permissions_storage(self) -> bool:
         await self.print_section_async("Permissions & Advanced Storage Setup")
-        status = True
-        if not await run_with_progress_async("Configuring home directory permissions", self.home_permissions_async, task_name="permissions_storage"):
-            status = False
-        if not await run_with_progress_async("Installing & Configuring ZFS", self.install_configure_zfs_async, task_name="permissions_storage"):
-            status = False
-        return status
+        return await self.run_concurrently_async([
+            ("Configuring home directory permissions", self.home_permissions_async),
+            ("Installing & Configuring ZFS", self.install_configure_zfs_async),
+        ], task_name="permissions_storage")
+
+    @staticmethod
+    def _apply_home_permissions(home: Path, uid: int, gid: int) -> Tuple[int, int]:
+        """Chown everything under home and set g+s on its directories in one walk.
+
+        Returns (chown failures, setgid failures). Symlinks are re-owned
+        themselves and never followed, like chown -R.
+        """
+        chown_errors = setgid_errors = 0
+
+        def fix(name: str, dir_fd: Optional[int]) -> None:
+            # Resolve each entry relative to its parent's open fd (fstatat,
+            # fchownat, fchmodat) rather than re-walking the full path.
+            nonlocal chown_errors, setgid_errors
+            try:
+                st = os.stat(name, dir_fd=dir_fd, follow_symlinks=False)
+                if st.st_uid != uid or st.st_gid != gid:
+                    os.chown(name, uid, gid, dir_fd=dir_fd, follow_symlinks=False)
+            except OSError:
+                chown_errors += 1
+                return
+            if stat.S_ISDIR(st.st_mode) and not st.st_mode & stat.S_ISGID:
+                try:
+                    os.chmod(name, stat.S_IMODE(st.st_mode) | stat.S_ISGID, dir_fd=dir_fd)
+                except OSError:
+                    setgid_errors += 1
+
+        def walk_error(_: OSError) -> None:
+            nonlocal chown_errors
+            chown_errors += 1
+
+        fix(str(home), None)
+        for _, dirs, files, dir_fd in os.fwalk(home, onerror=walk_error):
+            for name in dirs:
+                fix(name, dir_fd)
+            for name in files:
+                fix(name, dir_fd)
+        return chown_errors, setgid_errors
 
     async def home_permissions_async(self) -> bool:
+        home = self.config.USER_HOME
         try:
-            await run_command_async(["chown", "-R", f"{self.config.USERNAME}:{self.config.USERNAME}", str(self.config.USER_HOME)])
-            self.logger.info(f"Ownership of {self.config.USER_HOME} set to {self.config.USERNAME}.")
-        except subprocess.CalledProcessError:
-            self.logger.error(f"Failed to change ownership of {self.config.USER_HOME}.")
+            user_pw = pwd.getpwnam(self.config.USERNAME)
+        except KeyError:
+            self.logger.error(f"User {self.config.USERNAME} does not exist.")
             return False
-        try:
-            await run_command_async(["find", str(self.config.USER_HOME), "-type", "d", "-exec", "chmod", "g+s", "{}", ";"])
+        # One pass over the tree for both ownership and the setgid bit instead
+        # of a chown -R walk followed by a find walk.
+        loop = asyncio.get_running_loop()
+        chown_errors, setgid_errors = await loop.run_in_executor(
+            None, self._apply_home_permissions, home, user_pw.pw_uid, user_pw.pw_gid
+        )
+        if chown_errors:
+            self.logger.error(f"Failed to change ownership of {chown_errors} paths under {home}.")
+            return False
+        self.logger.info(f"Ownership of {home} set to {self.config.USERNAME}.")
+        if setgid_errors:
+            self.logger.warning(f"Failed to set setgid bit on {setgid_errors} directories.")
+        else:
             self.logger.info("Setgid bit applied on home directories.")
-        except subprocess.CalledProcessError:
-            self.logger.warning("Failed to set setgid bit.")
         if await command_exists_async("setfacl"):
             try:
                 await run_command_async(["setfacl", "-R", "-d", "-m", f"u:{self.config.USERNAME}:rwx", str(self.config.USER_HOME)])
@@ -1103,6 +1757,7 @@ class FedoraDesktopSetup:
             self.logger.warning("Could not check for ZFS kernel module.")
         try:
             await run_command_async(["dnf", "install", "-y", "zfs-dkms", "zfs"])
+            _which.cache_clear()
             self.logger.info("ZFS packages installed.")
         except subprocess.CalledProcessError as e:
             self.logger.error(f"Failed to install ZFS packages: {e}")
@@ -1115,12 +1770,19 @@ class FedoraDesktopSetup:
         except Exception:
             self.logger.warning("Could not verify ZFS installation.")
             return True
-        for service in ["zfs-import-cache.service", "zfs-mount.service"]:
-            try:
-                await run_command_async(["systemctl", "enable", service])
-                self.logger.info(f"Enabled {service}.")
-            except subprocess.CalledProcessError:
-                self.logger.warning(f"Could not enable {service}.")
+        zfs_units = ["zfs-import-cache.service", "zfs-mount.service"]
+        try:
+            # One systemctl call (and one daemon reload) for both units.
+            await run_command_async(["systemctl", "enable"] + zfs_units)
+            self.logger.info(f"Enabled {', '.join(zfs_units)}.")
+        except subprocess.CalledProcessError:
+            # Fall back to one unit at a time to report which one failed.
+            for service in zfs_units:
+                try:
+                    await run_command_async(["systemctl", "enable", service])
+                    self.logger.info(f"Enabled {service}.")
+                except subprocess.CalledProcessError:
+                    self.logger.warning(f"Could not enable {service}.")
         mount_point = Path("/media/WD_BLACK")
         try:
             mount_point.mkdir(parents=True, exist_ok=True)
@@ -1179,43 +1841,49 @@ class FedoraDesktopSetup:
     # ----------------------------------------------------------------
     async def phase_additional_apps(self) -> bool:
         await self.print_section_async("Additional Applications & Tools")
-        status = True
-    
-        # Ensure Flatpak is installed via dnf.
-        await run_with_progress_async(
-            "Installing Flatpak via dnf",
-            lambda: run_command_async(["dnf", "install", "-y", "flatpak"]),
-            task_name="additional_apps"
-        )
-        
-        # Add the Flathub repository if not already added.
-        await run_with_progress_async(
-            "Adding Flathub repository",
-            lambda: run_command_async(
-                ["flatpak", "remote-add", "--if-not-exists", "flathub", "https://dl.flathub.org/repo/flathub.flatpakrepo"]
-            ),
-            task_name="additional_apps"
-        )
-        
-        # Install all Flatpak apps from the configured list.
-        apps_success, apps_failed = await run_with_progress_async(
-            "Installing Flatpak Apps",
-            self.install_flatpak_and_apps_async,
-            task_name="additional_apps"
-        )
+        # The Flatpak apps come from Flathub and VS Code is an RPM, so the two
+        # downloads and installs can overlap; VS Code does not need Flatpak.
+        return await self.run_concurrently_async([
+            ("Installing Flatpak Apps", self.flatpak_apps_async),
+            ("Installing VS Code", self.install_configure_vscode_async),
+        ], task_name="additional_apps")
+
+    async def flatpak_apps_async(self) -> bool:
+        # Flatpak is part of the PACKAGES transaction in Phase 1; only fall back
+        # to a separate dnf run if that install did not provide it. Raise so
+        # the step is reported as failed rather than completed.
+        if not await self.ensure_flatpak_async():
+            raise Exception("Flatpak is not available; skipping Flatpak apps")
+        apps_success, apps_failed = await self.install_flatpak_and_apps_async()
         if apps_failed and len(apps_failed) > len(self.config.FLATPAK_APPS) * 0.5:
             self.logger.error(f"Flatpak app installation failures: {', '.join(apps_failed)}")
-            status = False
-    
-        # Install VS Code using the provided download link.
-        if not await run_with_progress_async(
-            "Installing VS Code",
-            self.install_configure_vscode_async,
-            task_name="additional_apps"
-        ):
-            status = False
-    
-        return status
+            return False
+        return True
+
+    async def ensure_flatpak_async(self) -> bool:
+        if await command_exists_async("flatpak"):
+            self.logger.info("Flatpak is already installed.")
+            return True
+        try:
+            await run_command_async(["dnf", "install", "-y", "flatpak"])
+            _which.cache_clear()
+            return await command_exists_async("flatpak")
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"Failed to install Flatpak: {e}")
+            return False
+
+    async def installed_flatpaks_async(self) -> Set[str]:
+        """Return the IDs of all installed Flatpak apps from a single flatpak query."""
+        try:
+            result = await run_command_async(
+                ["flatpak", "list", "--app", "--columns=application"],
+                capture_output=True,
+                text=True
+            )
+            return set(result.stdout.split())
+        except subprocess.CalledProcessError as e:
+            self.logger.warning(f"Failed to list installed Flatpak apps: {e}")
+            return set()
 
     async def install_flatpak_and_apps_async(self) -> Tuple[List[str], List[str]]:
         successful = []
@@ -1230,51 +1898,68 @@ class FedoraDesktopSetup:
             self.logger.warning(f"Failed to add Flathub remote: {e}")
         
         self.logger.info("Installing Flatpak Apps...")
+        installed = await self.installed_flatpaks_async()
+        missing = [app for app in self.config.FLATPAK_APPS if app not in installed]
         for app in self.config.FLATPAK_APPS:
-            # First, check if the app is already installed.
-            try:
-                await run_command_async(
-                    ["flatpak", "info", app],
-                    capture_output=True,
-                    text=True
-                )
+            if app in installed:
                 self.logger.info(f"Flatpak app {app} is already installed.")
                 successful.append(app)
-                continue
-            except subprocess.CalledProcessError:
-                # App not installed; proceed with installation.
-                pass
-    
+        if not missing:
+            return successful, failed
+
+        try:
+            # One transaction resolves and downloads shared runtimes once
+            # instead of once per app.
+            self.logger.info(f"Installing Flatpak apps: {' '.join(missing)}")
+            await run_command_async(
+                ["flatpak", "install", "--assumeyes", "--noninteractive", "flathub"] + missing
+            )
+            successful.extend(missing)
+        except subprocess.CalledProcessError as e:
+            # A single bad ref fails the whole transaction; retry one at a time
+            # so the rest still get installed.
+            self.logger.warning(f"Batched Flatpak install failed ({e}); retrying apps individually.")
+            installed = await self.installed_flatpaks_async()
+            for app in missing:
+                if app in installed:
+                    successful.append(app)
+                    continue
+                try:
+                    await run_command_async(
+                        ["flatpak", "install", "--assumeyes", "--noninteractive", "flathub", app]
+                    )
+                    self.logger.info(f"Installed Flatpak app: {app}")
+                    successful.append(app)
+                except Exception as e:
+                    self.logger.warning(f"Failed to install Flatpak app {app}: {e}")
+                    failed.append(app)
+
+        # Special post-install configuration for Postman
+        if "com.getpostman.Postman" in missing and "com.getpostman.Postman" in successful:
             try:
-                self.logger.info(f"Installing Flatpak app: {app}")
-                await run_command_async(
-                    ["flatpak", "install", "--assumeyes", "--noninteractive", "flathub", app]
-                )
-                self.logger.info(f"Installed Flatpak app: {app}")
-                successful.append(app)
-                
-                # Special post-install configuration for Postman
-                if app == "com.getpostman.Postman":
-                    cert_dir = Path.home() / ".var" / "app" / "com.getpostman.Postman" / "config" / "Postman" / "proxy"
-                    cert_file = cert_dir / "postman-proxy-ca.crt"
-                    if not cert_file.exists():
-                        self.logger.info("Postman missing proxy certificate; generating it now...")
-                        cert_dir.mkdir(parents=True, exist_ok=True)
-                        await run_command_async([
-                            "openssl", "req",
-                            "-subj", "/C=US/CN=Postman Proxy",
-                            "-new", "-newkey", "rsa:2048",
-                            "-sha256", "-days", "365",
-                            "-nodes", "-x509",
-                            "-keyout", str(cert_dir / "postman-proxy-ca.key"),
-                            "-out", str(cert_file)
-                        ])
-                        self.logger.info("Postman proxy certificate generated successfully.")
+                await self.configure_postman_async()
             except Exception as e:
-                self.logger.warning(f"Failed to install Flatpak app {app}: {e}")
-                failed.append(app)
+                self.logger.warning(f"Failed to configure Postman: {e}")
         
         return successful, failed
+
+    async def configure_postman_async(self) -> None:
+        cert_dir = Path.home() / ".var" / "app" / "com.getpostman.Postman" / "config" / "Postman" / "proxy"
+        cert_file = cert_dir / "postman-proxy-ca.crt"
+        if cert_file.exists():
+            return
+        self.logger.info("Postman missing proxy certificate; generating it now...")
+        cert_dir.mkdir(parents=True, exist_ok=True)
+        await run_command_async([
+            "openssl", "req",
+            "-subj", "/C=US/CN=Postman Proxy",
+            "-new", "-newkey", "rsa:2048",
+            "-sha256", "-days", "365",
+            "-nodes", "-x509",
+            "-keyout", str(cert_dir / "postman-proxy-ca.key"),
+            "-out", str(cert_file)
+        ])
+        self.logger.info("Postman proxy certificate generated successfully.")
     
     async def install_configure_vscode_async(self) -> bool:
         try:
@@ -1290,6 +1975,7 @@ class FedoraDesktopSetup:
     
             # Install the downloaded RPM using dnf.
             await run_command_async(["dnf", "install", "-y", str(tmp_file)])
+            _which.cache_clear()
             self.logger.info("VS Code installed successfully from RPM.")
     
             # Clean up the downloaded file.
@@ -1311,7 +1997,7 @@ class FedoraDesktopSetup:
             # Ensure user configuration directory exists and set proper ownership.
             config_dir = self.config.USER_HOME / ".config" / "Code" / "User"
             config_dir.mkdir(parents=True, exist_ok=True)
-            await run_command_async(["chown", "-R", f"{self.config.USERNAME}:{self.config.USERNAME}", str(config_dir)])
+            await run_command_async(["chown", "-R", self._owner, str(config_dir)])
             self.logger.info("VS Code installation and configuration completed successfully.")
             return True
         except Exception as e:
@@ -1323,66 +2009,82 @@ class FedoraDesktopSetup:
     # ----------------------------------------------------------------
     async def phase_cleanup_final(self) -> bool:
         await self.print_section_async("Cleanup & Final Configurations")
-        status = True
+        status = await self.run_concurrently_async([
+            ("Configuring Wayland environment", self.configure_wayland_async),
+            ("Installing and enabling Tailscale", self.install_enable_tailscale_async),
+        ], task_name="cleanup_final")
+        # Clean up last so the Tailscale install reuses the cached dnf metadata
+        # instead of refetching it after `dnf clean all`.
+        if not await self.cleanup_system_async():
+            status = False
+        return status
+
+    async def cleanup_system_async(self) -> bool:
+        try:
+            if time.time() - CLEANUP_STAMP.stat().st_mtime < CLEANUP_INTERVAL:
+                self.logger.info("System cleanup ran recently; skipping.")
+                return True
+        except OSError:
+            pass
         try:
             await run_command_async(["dnf", "autoremove", "-y"])
             await run_command_async(["dnf", "clean", "all"])
             self.logger.info("System cleanup completed.")
+            try:
+                CLEANUP_STAMP.parent.mkdir(parents=True, exist_ok=True)
+                CLEANUP_STAMP.touch()
+            except OSError as e:
+                self.logger.debug(f"Could not record cleanup timestamp: {e}")
+            return True
         except subprocess.CalledProcessError as e:
             self.logger.error(f"System cleanup failed: {e}")
-            status = False
-        if not await run_with_progress_async("Configuring Wayland environment", self.configure_wayland_async, task_name="cleanup_final"):
-            status = False
-        if not await run_with_progress_async("Installing and enabling Tailscale", self.install_enable_tailscale_async, task_name="cleanup_final"):
-            status = False
-        return status
+            return False
 
     async def configure_wayland_async(self) -> bool:
         etc_env = Path("/etc/environment")
         loop = asyncio.get_running_loop()
+        wayland_vars = WAYLAND_ENV_VARS
         try:
-            current = await loop.run_in_executor(None, lambda: etc_env.read_text()) if etc_env.is_file() else ""
+            # Stay in bytes from read to write; nothing here needs decoding.
+            current = await loop.run_in_executor(None, etc_env.read_bytes) if etc_env.is_file() else b""
             vars_current = {}
             for line in current.splitlines():
-                if "=" in line:
-                    key, val = line.split("=", 1)
+                key, sep, val = line.partition(b"=")
+                if sep:
                     vars_current[key] = val
             updated = False
-            wayland_vars = {
-                "GDK_BACKEND": "wayland",
-                "QT_QPA_PLATFORM": "wayland",
-                "SDL_VIDEODRIVER": "wayland",
-                "MOZ_ENABLE_WAYLAND": "1",
-                "MOZ_DBUS_REMOTE": "1",
-            }
             for key, val in wayland_vars.items():
                 if vars_current.get(key) != val:
                     vars_current[key] = val
                     updated = True
             if updated:
-                new_content = "\n".join(f"{k}={v}" for k, v in vars_current.items()) + "\n"
-                await loop.run_in_executor(None, lambda: etc_env.write_text(new_content))
+                buf = io.BytesIO()
+                buf.writelines(b"%s=%s\n" % (k, v) for k, v in vars_current.items())
+                new_content = buf.getvalue()
+                await loop.run_in_executor(None, lambda: etc_env.write_bytes(new_content))
                 self.logger.info(f"{etc_env} updated with Wayland variables.")
             else:
                 self.logger.info(f"No changes needed in {etc_env}.")
         except Exception as e:
             self.logger.warning(f"Failed to update {etc_env}: {e}")
-        user_env_dir = self.config.USER_HOME / ".config" / "environment.d"
-        user_env_file = user_env_dir / "wayland.conf"
+        user_env_file = self._user_env_file
         try:
-            await loop.run_in_executor(None, lambda: user_env_dir.mkdir(parents=True, exist_ok=True))
-            content = "\n".join(f"{k}={v}" for k, v in wayland_vars.items()) + "\n"
+            await loop.run_in_executor(None, lambda: user_env_file.parent.mkdir(parents=True, exist_ok=True))
+            buf = io.BytesIO()
+            buf.writelines(b"%s=%s\n" % (k, v) for k, v in wayland_vars.items())
+            content = buf.getvalue()
             file_exists = await loop.run_in_executor(None, lambda: user_env_file.is_file())
             if file_exists:
-                current_content = await loop.run_in_executor(None, lambda: user_env_file.read_text())
+                current_content = await loop.run_in_executor(None, lambda: user_env_file.read_bytes())
                 if current_content.strip() != content.strip():
                     await self.backup_file_async(user_env_file)
-                    await loop.run_in_executor(None, lambda: user_env_file.write_text(content))
+                    await loop.run_in_executor(None, lambda: user_env_file.write_bytes(content))
                     self.logger.info(f"Updated {user_env_file} with Wayland variables.")
             else:
-                await loop.run_in_executor(None, lambda: user_env_file.write_text(content))
+                await loop.run_in_executor(None, lambda: user_env_file.write_bytes(content))
                 self.logger.info(f"Created {user_env_file} with Wayland variables.")
-            await run_command_async(["chown", f"{self.config.USERNAME}:{self.config.USERNAME}", str(user_env_file)])
+            user_pw = pwd.getpwnam(self.config.USERNAME)
+            os.chown(user_env_file, user_pw.pw_uid, user_pw.pw_gid)
             return True
         except Exception as e:
             self.logger.warning(f"Failed to update {user_env_file}: {e}")
@@ -1407,6 +2109,7 @@ class FedoraDesktopSetup:
                 # Install Tailscale using dnf.
                 self.logger.info("Installing Tailscale via dnf...")
                 await run_command_async(["dnf", "install", "-y", "tailscale"])
+                _which.cache_clear()
                 tailscale_installed = await command_exists_async("tailscale")
                 if tailscale_installed:
                     self.logger.info("Tailscale installed successfully.")
@@ -1418,6 +2121,10 @@ class FedoraDesktopSetup:
                 return False
     
         try:
+            active_state, unit_file_state = await service_state_async("tailscaled.service")
+            if active_state == "active" and unit_file_state == "enabled":
+                self.logger.info("Tailscale service is already enabled and running.")
+                return True
             # Enable and start the tailscaled service in one step.
             await run_command_async(["systemctl", "enable", "--now", "tailscaled"])
         except Exception as e:
@@ -1433,16 +2140,18 @@ class FedoraDesktopSetup:
     async def phase_final_checks(self) -> bool:
         await self.print_section_async("Final System Checks")
         info = await self.final_checks_async()
-        elapsed = time.time() - self.start_time
+        elapsed = (time.monotonic_ns() - self.start_ns) // 1_000_000_000
         hours, remainder = divmod(elapsed, 3600)
         minutes, seconds = divmod(remainder, 60)
         summary = f"""
 ✅ Fedora Setup & Hardening completed successfully!
 
-⏱️ Total runtime: {int(hours)}h {int(minutes)}m {int(seconds)}s
+⏱️ Total runtime: {hours}h {minutes}m {seconds}s
 
 Kernel Version: {info.get("kernel", "Unknown")}
+CPU Model: {info.get("cpu", "Unknown")}
 Distribution: {info.get("distribution", "Unknown")}
+Services: {info.get("services", "Unknown")}
 
 No automatic reboot is scheduled.
 """
@@ -1451,40 +2160,97 @@ No automatic reboot is scheduled.
         self.logger.info("Final system checks completed. No reboot scheduled.")
         return True
 
+    @staticmethod
+    def _probe_kernel() -> str:
+        return os.uname().release
+
+    @staticmethod
+    def _probe_cpu() -> str:
+        with open("/proc/cpuinfo") as f:
+            return next(
+                (line.split(":", 1)[1].strip() for line in f if line.startswith("model name")),
+                "",
+            )
+
+    def _probe_distribution(self) -> str:
+        os_info = self.preflight.os_release if self.preflight and self.preflight.os_release else read_os_release()
+        return os_info.get("PRETTY_NAME", "Unknown")
+
+    @staticmethod
+    def _probe_uptime() -> str:
+        with open("/proc/uptime") as f:
+            up_seconds = int(float(f.read().split()[0]))
+        days, remainder = divmod(up_seconds, 86400)
+        hours, remainder = divmod(remainder, 3600)
+        return f"up {days}d {hours}h {remainder // 60}m"
+
+    @staticmethod
+    def _probe_disk() -> str:
+        st = os.statvfs("/")
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        avail = st.f_bavail * st.f_frsize
+        # Same percentage df reports: used against what non-root users can
+        # reach, rounded up.
+        percent = -(-100 * used // (used + avail)) if used + avail else 0
+        gib = 1024 ** 3
+        return (
+            f"/ {total / gib:.1f}G total, {used / gib:.1f}G used, "
+            f"{avail / gib:.1f}G free ({percent}%)"
+        )
+
+    @staticmethod
+    def _probe_memory() -> str:
+        meminfo = read_meminfo()
+        total_kib, avail_kib = meminfo["MemTotal"], meminfo["MemAvailable"]
+        return (
+            f"Mem: {total_kib / 1048576:.1f}Gi total, "
+            f"{(total_kib - avail_kib) / 1048576:.1f}Gi used, "
+            f"{avail_kib / 1048576:.1f}Gi available"
+        )
+
+    @staticmethod
+    def _probe_load() -> str:
+        return " ".join(f"{avg:.2f}" for avg in read_loadavg())
+
+    async def _probe_services_async(self) -> str:
+        # systemctl is-active takes several units and prints one state per
+        # line, so one call covers every service. It exits non-zero when any
+        # unit is inactive, which is not an error here.
+        services = self.config.SERVICES
+        result = await run_command_async(
+            ["systemctl", "is-active"] + services, check=False, capture_output=True, text=True
+        )
+        states = result.stdout.splitlines()
+        states += ["unknown"] * (len(services) - len(states))
+        return ", ".join(f"{svc}={state.strip()}" for svc, state in zip(services, states))
+
     async def final_checks_async(self) -> Dict[str, str]:
+        # (info key, log label, probe). The probes are independent, so run
+        # them side by side on the executor and keep whatever succeeded.
+        probes: List[Tuple[str, str, Callable[[], Any]]] = [
+            ("kernel", "Kernel version", self._probe_kernel),
+            ("cpu", "CPU model", self._probe_cpu),
+            ("distribution", "Distribution", self._probe_distribution),
+            ("uptime", "System uptime", self._probe_uptime),
+            ("disk_usage", "Disk usage (root)", self._probe_disk),
+            ("memory", "Memory usage", self._probe_memory),
+            ("load", "Load average", self._probe_load),
+            ("services", "Service status", self._probe_services_async),
+        ]
+        # File probes go to the executor; subprocess probes are awaited directly.
+        results = await asyncio.gather(
+            *(probe() if asyncio.iscoroutinefunction(probe) else asyncio.to_thread(probe)
+              for _, _, probe in probes),
+            return_exceptions=True,
+        )
         info = {}
-        try:
-            kernel = await run_command_async(["uname", "-r"], capture_output=True, text=True)
-            self.logger.info(f"Kernel version: {kernel.stdout.strip()}")
-            info["kernel"] = kernel.stdout.strip()
-        except Exception as e:
-            self.logger.warning(f"Failed to get kernel version: {e}")
-        try:
-            distro = await run_command_async(["lsb_release", "-ds"], capture_output=True, text=True)
-            self.logger.info(f"Distribution: {distro.stdout.strip()}")
-            info["distribution"] = distro.stdout.strip()
-        except Exception as e:
-            self.logger.warning(f"Failed to get distribution info: {e}")
-        try:
-            uptime = await run_command_async(["uptime", "-p"], capture_output=True, text=True)
-            self.logger.info(f"System uptime: {uptime.stdout.strip()}")
-            info["uptime"] = uptime.stdout.strip()
-        except Exception as e:
-            self.logger.warning(f"Failed to get uptime: {e}")
-        try:
-            df_output = await run_command_async(["df", "-h", "/"], capture_output=True, text=True)
-            df_line = df_output.stdout.splitlines()[1]
-            self.logger.info(f"Disk usage (root): {df_line}")
-            info["disk_usage"] = df_line
-        except Exception as e:
-            self.logger.warning(f"Failed to get disk usage: {e}")
-        try:
-            free_output = await run_command_async(["free", "-h"], capture_output=True, text=True)
-            mem_line = next((l for l in free_output.stdout.splitlines() if l.startswith("Mem:")), "")
-            self.logger.info(f"Memory usage: {mem_line}")
-            info["memory"] = mem_line
-        except Exception as e:
-            self.logger.warning(f"Failed to get memory usage: {e}")
+        for (key, label, _), result in zip(probes, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Failed to get {label}: {result}")
+            elif result:
+                self.logger.info(f"{label}: {result}")
+                info[key] = result
         return info
 
 # ----------------------------------------------------------------
@@ -1496,17 +2262,43 @@ async def main_async() -> None:
         setup = FedoraDesktopSetup()
         global setup_instance
         setup_instance = setup
-        await setup.check_root_async()
-        if not await setup.phase_preflight():
-            sys.exit(1)
-        await setup.phase_system_update()
-        await setup.phase_repo_shell_setup()
-        await setup.phase_security_hardening()
-        await setup.phase_user_customization()
-        await setup.phase_permissions_storage()
-        await setup.phase_additional_apps()
-        await setup.phase_cleanup_final()
-        await setup.phase_final_checks()
+        # Phases in the same group do not depend on each other and run
+        # concurrently; the groups themselves run in order. A critical phase
+        # that fails stops the run: everything after it assumes it worked.
+        # Package failures in system_update are expected (not every name is
+        # in the stock repos), so only preflight is critical.
+        phases: List[List[Tuple[str, Callable[[], Any], bool]]] = [
+            [("preflight", setup.phase_preflight, True)],
+            [("system_update", setup.phase_system_update, False)],
+            [("repo_shell", setup.phase_repo_shell_setup, False)],
+            [("security", setup.phase_security_hardening, False),
+             ("user_custom", setup.phase_user_customization, False)],
+            [("permissions_storage", setup.phase_permissions_storage, False)],
+            [("additional_apps", setup.phase_additional_apps, False)],
+            [("cleanup_final", setup.phase_cleanup_final, False)],
+            [("final", setup.phase_final_checks, False)],
+        ]
+        timings: List[Tuple[str, float]] = []
+        for group in phases:
+            group_name = "+".join(phase_name for phase_name, _, _ in group)
+            t0 = time.perf_counter_ns()
+            # A lone phase still raises into the handlers below; in a group, one
+            # phase failing must not cancel its siblings.
+            results = await asyncio.gather(
+                *(phase_func() for _, phase_func, _ in group), return_exceptions=len(group) > 1
+            )
+            dt = (time.perf_counter_ns() - t0) / 1e9
+            timings.append((group_name, dt))
+            setup.logger.info(f"Phase {group_name} took {dt:.2f}s")
+            for (phase_name, _, critical), result in zip(group, results):
+                if isinstance(result, BaseException):
+                    setup.logger.error(f"Phase {phase_name} failed: {result}")
+                if critical and (isinstance(result, BaseException) or not result):
+                    setup.logger.error(f"Critical phase {phase_name} failed; skipping remaining phases.")
+                    print_status_report()
+                    sys.exit(1)
+        for phase_name, dt in sorted(timings, key=lambda item: item[1], reverse=True):
+            setup.logger.info(f"{phase_name:<20} {dt:8.2f}s")
     except KeyboardInterrupt:
         console.print("\n[warning]Setup interrupted by user.[/warning]")
         try:
@@ -1527,6 +2319,8 @@ def main() -> None:
     try:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
+        loop.set_default_executor(EXECUTOR)
+        _prewarm()
         setup_signal_handlers(loop)
         global setup_instance
         setup_instance = None